@@ -1,40 +1,468 @@
 #https://project-0c32.onrender.com
 
 
+import functools
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+import time
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import flask
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
-import plotly.express as px
+from dash import dcc, html, Patch
+from dash.dependencies import Input, Output, State
+from dash.exceptions import MissingCallbackContextException, PreventUpdate
+import plotly.utils
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 import numpy as np
 import dash_bootstrap_components as dbc
 
-def load_and_clean_data(filepath):
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+COUNT_COLUMNS = ['Total', 'Men', 'Women']
+
+OCCUPATION_CATEGORIES = {
+    "business": ["business", "finance", "administration"],
+    "science": ["natural", "applied sciences", "engineering"],
+    "health": ["health", "nurse", "medical", "paramedical"],
+    "education": ["education", "law", "social"],
+    "art": ["art", "culture", "recreation"]
+}
+
+RATIO_METRICS = {
+    'women_to_men': ('Women', 'Men'),
+    'men_to_women': ('Men', 'Women'),
+    'women_share': ('Women', 'Total'),
+    'men_share': ('Men', 'Total')
+}
+
+SERVICE_TYPES = ['all', 'police', 'fire', 'nurse']
+ENGINEERING_TYPES = ['computer', 'mechanical', 'electrical']
+
+EXPORT_BATCH_ROWS = 10_000
+
+def load_and_clean_data(filepath, chunksize=None, row_filter=None, count_columns=COUNT_COLUMNS):
+    if chunksize:
+        return load_census_chunks(filepath, chunksize, row_filter)
+    
     df = pd.read_csv(filepath)
-    for col in ['Total', 'Men', 'Women']:
+    for col in count_columns:
         if col in df.columns:
             df[col] = df[col].astype(str).str.replace(',', '').str.replace('"', '')
             df[col] = pd.to_numeric(df[col], errors='coerce')
-    df = df.dropna(subset=['Total', 'Men', 'Women'])
+    df = df.dropna(subset=count_columns)
+    if row_filter is not None:
+        df = df[row_filter(df)]
     return df
 
-def get_essential_services_data(df):
+def clean_count_chunk(chunk):
+    count_columns = [col for col in COUNT_COLUMNS if col in chunk.columns]
+    for col in count_columns:
+        if not pd.api.types.is_numeric_dtype(chunk[col]):
+            chunk[col] = pd.to_numeric(chunk[col].astype(str).str.replace(',', '').str.replace('"', ''), errors='coerce')
+    chunk = chunk.dropna(subset=count_columns)
+    for col in count_columns:
+        chunk[col] = pd.to_numeric(chunk[col], downcast='integer')
+    return chunk
+
+def load_census_chunks(filepath, chunksize=100_000, row_filter=None):
+    columns = pd.read_csv(filepath, nrows=0).columns
+    label_columns = [col for col in columns if col not in COUNT_COLUMNS]
+    
+    chunks = []
+    for chunk in pd.read_csv(filepath, chunksize=chunksize, thousands=',', dtype={col: 'category' for col in label_columns}):
+        if row_filter is not None:
+            chunk = chunk[row_filter(chunk)]
+            for col in label_columns:
+                chunk[col] = chunk[col].cat.remove_unused_categories()
+        chunk = clean_count_chunk(chunk)
+        if len(chunk):
+            chunks.append(chunk)
+    
+    if not chunks:
+        return pd.DataFrame({col: pd.Series(dtype='category' if col in label_columns else 'int64') for col in columns})
+    
+    df = pd.concat([chunk.drop(columns=label_columns) for chunk in chunks])
+    for col in label_columns:
+        df[col] = pd.api.types.union_categoricals([chunk[col] for chunk in chunks])
+    return df[list(columns)]
+
+def noc_level_filter(*levels):
+    def matches(values):
+        codes = pd.Series(values, dtype=object).str.extract(r'^(\d{1,5})\s', expand=False)
+        return codes.str.len().isin(levels).to_numpy()
+    
+    def row_filter(df):
+        occupations = df['Occupation']
+        if isinstance(occupations.dtype, pd.CategoricalDtype):
+            codes = occupations.cat.codes.to_numpy()
+            return matches(occupations.cat.categories)[codes] & (codes >= 0)
+        return matches(occupations.to_numpy())
+    return row_filter
+
+def build_compact_frame(df):
+    if 'Occupation' not in df.columns:
+        return df
+    
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            values = values.to_numpy()
+            if np.issubdtype(values.dtype, np.integer) and values.dtype.itemsize > 4 and values.size and values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max:
+                values = values.astype(np.int32, copy=False)
+            values.flags.writeable = False
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.array
+        else:
+            codes, table = pd.factorize(values)
+            values = pd.Categorical.from_codes(codes, [sys.intern(str(label)) for label in table])
+        columns[col] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)), copy=False)
+
+def get_occupation_codes(df):
+    occupations = df['Occupation'].cat
+    return occupations.codes.to_numpy(), occupations.categories
+
+def tokenize(text):
+    return re.findall(r'\w+', text.lower())
+
+def build_occupation_index(df):
+    codes, categories = get_occupation_codes(df)
+    labels = [str(label) for label in categories]
+    order = np.argsort(codes, kind='stable')
+    offsets = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+    first_rows = np.full(len(labels), len(codes), dtype=np.intp)
+    has_rows = offsets[1:] > offsets[:-1]
+    first_rows[has_rows] = order[offsets[:-1][has_rows]]
+    
+    tokens = []
+    token_labels = []
+    ranks = np.empty(len(labels), dtype=np.int64)
+    for label_id, label in enumerate(labels):
+        words = set(tokenize(label))
+        tokens.extend(words)
+        token_labels.extend([label_id] * len(words))
+        code = re.match(r'\d{1,5}\s', label)
+        ranks[label_id] = len(code.group()) if code else 9
+    
+    tokens = np.array(tokens, dtype=str)
+    token_order = np.argsort(tokens, kind='stable')
+    unique_tokens, token_ids = np.unique(tokens[token_order], return_inverse=True)
+    
+    return {
+        'labels': labels,
+        'lower_labels': [label.lower() for label in labels],
+        'ids': {label: label_id for label_id, label in enumerate(labels)},
+        'ranks': ranks,
+        'first_rows': first_rows,
+        'row_order': order,
+        'row_offsets': offsets,
+        'tokens': unique_tokens,
+        'token_offsets': np.searchsorted(token_ids, np.arange(len(unique_tokens) + 1)),
+        'token_labels': np.array(token_labels, dtype=np.intp)[token_order]
+    }
+
+def get_token_labels(occupation_index, word):
+    upper = word[:-1] + chr(ord(word[-1]) + 1)
+    lo = np.searchsorted(occupation_index['tokens'], word, side='left')
+    hi = np.searchsorted(occupation_index['tokens'], upper, side='left')
+    label_ids = occupation_index['token_labels'][occupation_index['token_offsets'][lo]:occupation_index['token_offsets'][hi]]
+    return label_ids if hi - lo == 1 else np.unique(label_ids)
+
+def match_word_labels(occupation_index, words):
+    label_ids = get_token_labels(occupation_index, words[0])
+    for word in words[1:]:
+        if not len(label_ids):
+            break
+        label_ids = np.intersect1d(label_ids, get_token_labels(occupation_index, word), assume_unique=True)
+    return label_ids
+
+def get_label_rows(occupation_index, label_ids):
+    offsets = occupation_index['row_offsets']
+    parts = [occupation_index['row_order'][offsets[label_id]:offsets[label_id + 1]] for label_id in label_ids]
+    if not parts:
+        return np.array([], dtype=np.intp)
+    return np.sort(np.concatenate(parts))
+
+def find_keyword_labels(occupation_index, keyword):
+    words = tokenize(keyword)
+    if not words:
+        return np.array([], dtype=np.intp)
+    
+    label_ids = match_word_labels(occupation_index, words)
+    if len(words) > 1 and len(label_ids):
+        phrase = re.compile(r'\b' + r'\W+'.join(re.escape(word) for word in words))
+        label_ids = np.array([label_id for label_id in label_ids if phrase.search(occupation_index['lower_labels'][label_id])], dtype=np.intp)
+    return label_ids
+
+def find_keyword_rows(occupation_index, keyword):
+    return get_label_rows(occupation_index, find_keyword_labels(occupation_index, keyword))
+
+def match_any_keywords(occupation_index, keywords, rows=None):
+    matched = [find_keyword_labels(occupation_index, keyword) for keyword in keywords]
+    matched = get_label_rows(occupation_index, np.unique(np.concatenate(matched)) if matched else [])
+    if rows is None:
+        return matched
+    return np.intersect1d(rows, matched, assume_unique=True)
+
+def match_all_keywords(occupation_index, keywords, rows=None):
+    for keyword in keywords:
+        matched = find_keyword_rows(occupation_index, keyword)
+        rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+    return rows if rows is not None else np.array([], dtype=np.intp)
+
+def get_unique_occupation_rows(df, rows):
+    codes, _ = get_occupation_codes(df)
+    _, first = np.unique(codes[rows], return_index=True)
+    return rows[np.sort(first)]
+
+def get_occupation_names(df, rows):
+    codes, categories = get_occupation_codes(df)
+    return np.asarray(categories, dtype=object)[codes[rows]]
+
+def get_essential_services_rows(df, occupation_index=None):
+    if occupation_index is None:
+        occupation_index = build_occupation_index(df)
     essential_services = ['police', 'firefighter', 'nurse']
-    pattern = '|'.join(essential_services)
-    essential_df = df[df['Occupation'].str.contains(pattern, case=False, na=False)]
-    return essential_df
+    return match_any_keywords(occupation_index, essential_services)
 
-def get_noc_top_level_data(df):
-    pattern = r'^\d\s[A-Za-z]+'
-    top_level_df = df[df['Occupation'].str.match(pattern, na=False)]
+def get_essential_services_data(df):
+    return df.iloc[get_essential_services_rows(df)]
+
+def build_noc_index(df):
+    if 'Occupation' in df.columns:
+        codes = df['Occupation'].str.extract(r'^(\d{1,5})\s', expand=False)
+    else:
+        codes = pd.Series([], dtype=object)
+    
+    rows = {code: np.asarray(positions) for code, positions in codes.groupby(codes).indices.items()}
+    children = {code: [] for code in rows}
+    roots = []
+    for code in sorted(rows):
+        parent = code[:-1]
+        while parent and parent not in rows:
+            parent = parent[:-1]
+        if parent:
+            children[parent].append(code)
+        else:
+            roots.append(code)
+    
+    levels = {}
+    for code, positions in rows.items():
+        levels.setdefault(len(code), []).append(positions)
+    levels = {level: np.sort(np.concatenate(parts)) for level, parts in levels.items()}
+    
+    return {'rows': rows, 'children': children, 'roots': roots, 'levels': levels}
+
+def get_noc_level_rows(noc_index, level):
+    return noc_index['levels'].get(level, np.array([], dtype=np.intp))
+
+def get_noc_subtree_rows(noc_index, code, leaves_only=False):
+    if code not in noc_index['rows']:
+        return np.array([], dtype=np.intp)
+    
+    parts = []
+    stack = [code]
+    while stack:
+        node = stack.pop()
+        node_children = noc_index['children'][node]
+        if not leaves_only or not node_children:
+            parts.append(noc_index['rows'][node])
+        stack.extend(node_children)
+    return np.sort(np.concatenate(parts))
+
+def get_noc_leaf_rows(noc_index, code):
+    return get_noc_subtree_rows(noc_index, code, leaves_only=True)
+
+def search_occupations(occupation_index, query, limit=20):
+    words = tokenize(query)
+    if not words:
+        return []
+    matches = match_word_labels(occupation_index, words)
+    ranked = matches[np.lexsort((occupation_index['first_rows'][matches], occupation_index['ranks'][matches]))][:limit]
+    return [occupation_index['labels'][label_id] for label_id in ranked]
+
+def get_occupation_rows(occupation_index, occupations):
+    label_ids = {occupation_index['ids'][occupation] for occupation in occupations if occupation in occupation_index['ids']}
+    return get_label_rows(occupation_index, sorted(label_ids))
+
+def get_noc_top_level_data(df, noc_index=None):
+    if noc_index is None:
+        noc_index = build_noc_index(df)
+    top_level_df = df.iloc[get_noc_level_rows(noc_index, 1)]
     return top_level_df
 
-def get_engineering_data(df):
+def get_engineering_rows(df, occupation_index=None):
+    if occupation_index is None:
+        occupation_index = build_occupation_index(df)
     engineering_occupations = ['computer engineer', 'mechanical engineer', 'electrical engineer']
-    pattern = '|'.join(engineering_occupations)
-    engineering_df = df[df['Occupation'].str.contains(pattern, case=False, na=False)]
-    return engineering_df
+    return match_any_keywords(occupation_index, engineering_occupations)
+
+def get_engineering_data(df):
+    return df.iloc[get_engineering_rows(df)]
+
+def get_service_type_rows(dataset, service_type):
+    rows = dataset['essential_services_rows']
+    if service_type != "all":
+        rows = match_any_keywords(dataset['occupation_index'], [service_type], rows)
+    return rows
+
+def get_engineering_type_rows(dataset, selected_types):
+    engineering_filters = [engineering_type for engineering_type in ENGINEERING_TYPES if engineering_type in selected_types]
+    return match_any_keywords(dataset['occupation_index'], engineering_filters or ENGINEERING_TYPES, dataset['engineering_rows'])
+
+def get_category_rows(dataset, keywords):
+    return match_any_keywords(dataset['occupation_index'], keywords)
+
+def compute_ratio(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    ratio = np.where(numerator > 0, np.inf, np.nan)
+    np.divide(numerator, denominator, out=ratio, where=denominator != 0)
+    return ratio
+
+def get_ratio_metric(df, rows, metric):
+    numerator, denominator = RATIO_METRICS[metric]
+    return compute_ratio(df[numerator].to_numpy()[rows], df[denominator].to_numpy()[rows])
+
+def select_bottom_k(values, k):
+    candidates = np.flatnonzero(~np.isnan(values))
+    k = min(k, len(candidates))
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    if k < len(candidates):
+        kth = np.partition(values[candidates], k - 1)[k - 1]
+        candidates = candidates[values[candidates] <= kth]
+    return candidates[np.argsort(values[candidates], kind='stable')[:k]]
+
+def select_top_k(values, k):
+    return select_bottom_k(-np.asarray(values), k)
+
+def get_noc_row_levels(noc_index, row_count):
+    levels = np.zeros(row_count, dtype=np.int8)
+    for level, rows in noc_index['levels'].items():
+        levels[rows] = level
+    return levels
+
+def build_hierarchy_rollup(df, noc_index, occupation_index):
+    row_levels = get_noc_row_levels(noc_index, len(df))
+    men = df['Men'].to_numpy()
+    women = df['Women'].to_numpy()
+    max_level = max(noc_index['levels'], default=0)
+    
+    rollup = {}
+    for category, keywords in OCCUPATION_CATEGORIES.items():
+        rows = match_any_keywords(occupation_index, keywords)
+        rows = rows[row_levels[rows] > 0]
+        levels = row_levels[rows]
+        
+        row_counts = np.bincount(levels, minlength=max_level + 1)
+        men_sum = np.bincount(levels, weights=men[rows], minlength=max_level + 1).astype(np.int64)
+        women_sum = np.bincount(levels, weights=women[rows], minlength=max_level + 1).astype(np.int64)
+        present = np.flatnonzero(row_counts)
+        men_sum, women_sum = men_sum[present], women_sum[present]
+        
+        total = men_sum + women_sum
+        rollup[category] = {
+            'levels': present,
+            'men': men_sum,
+            'women': women_sum,
+            'men_pct': np.divide(men_sum * 100, total, out=np.zeros(len(total)), where=total > 0),
+            'women_pct': np.divide(women_sum * 100, total, out=np.zeros(len(total)), where=total > 0)
+        }
+        for values in rollup[category].values():
+            values.flags.writeable = False
+    return rollup
+
+def get_export_rows(dataset, args):
+    rows = np.arange(len(dataset['df']))
+    
+    if 'level' in args:
+        level = args.get('level', type=int)
+        if level is None or level not in dataset['noc_index']['levels']:
+            raise ValueError(f"level must be one of {sorted(dataset['noc_index']['levels'])}")
+        rows = np.intersect1d(rows, get_noc_level_rows(dataset['noc_index'], level), assume_unique=True)
+    
+    if 'service' in args:
+        service_type = args['service']
+        if service_type not in SERVICE_TYPES:
+            raise ValueError(f"service must be one of {SERVICE_TYPES}")
+        rows = np.intersect1d(rows, get_service_type_rows(dataset, service_type), assume_unique=True)
+    
+    if 'engineering' in args:
+        selected_types = [value for value in args['engineering'].split(',') if value]
+        if any(value not in ENGINEERING_TYPES for value in selected_types):
+            raise ValueError(f"engineering must be a comma-separated subset of {ENGINEERING_TYPES}")
+        rows = np.intersect1d(rows, get_engineering_type_rows(dataset, selected_types), assume_unique=True)
+    
+    if 'category' in args:
+        category = args['category']
+        if category not in OCCUPATION_CATEGORIES:
+            raise ValueError(f"category must be one of {list(OCCUPATION_CATEGORIES)}")
+        rows = np.intersect1d(rows, get_category_rows(dataset, OCCUPATION_CATEGORIES[category]), assume_unique=True)
+    
+    keywords = [keyword for keyword in args.getlist('keyword') if keyword]
+    if keywords:
+        rows = np.intersect1d(rows, get_category_rows(dataset, keywords), assume_unique=True)
+    
+    return rows
+
+def get_export_etag(version, export_format, args):
+    query = sorted((key, value) for key, value in args.items(multi=True) if key != 'format')
+    digest = hashlib.sha1(json.dumps([export_format, query]).encode()).hexdigest()[:16]
+    return f'{version}-{digest}'
+
+def iter_export_batches(df, rows, batch_rows):
+    for start in range(0, len(rows), batch_rows):
+        yield df.iloc[rows[start:start + batch_rows]]
+
+def stream_csv(df, rows, batch_rows=EXPORT_BATCH_ROWS):
+    yield df.iloc[:0].to_csv(index=False)
+    for batch in iter_export_batches(df, rows, batch_rows):
+        yield batch.to_csv(index=False, header=False)
+
+def stream_jsonl(df, rows, batch_rows=EXPORT_BATCH_ROWS):
+    for batch in iter_export_batches(df, rows, batch_rows):
+        yield batch.to_json(orient='records', lines=True).rstrip('\n') + '\n'
+
+def stream_arrow(df, rows, batch_rows=EXPORT_BATCH_ROWS):
+    sink = io.BytesIO()
+    schema = pa.schema([
+        (col, pa.string() if isinstance(dtype, pd.CategoricalDtype) else pa.from_numpy_dtype(dtype))
+        for col, dtype in df.dtypes.items()
+    ])
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in iter_export_batches(df, rows, batch_rows):
+            writer.write_batch(pa.RecordBatch.from_pandas(batch, schema=schema, preserve_index=False))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', stream_csv),
+    'jsonl': ('application/x-ndjson', stream_jsonl),
+    'arrow': ('application/vnd.apache.arrow.stream', stream_arrow)
+}
 
 def get_province_data():
     provinces = {
@@ -54,15 +482,667 @@ def get_province_data():
     }
     return provinces
 
-try:
-    df = load_and_clean_data('data.csv')
-except:
-    df = pd.DataFrame()
+def allocate_province_counts(totals, provinces, low, high, rng):
+    populations = np.array([p['Population'] for p in provinces.values()], dtype=float)
+    proportions = populations / populations.sum()
+    
+    totals = np.asarray(totals, dtype=float)
+    variation = rng.uniform(low, high, size=(len(totals), len(provinces)))
+    return (totals[:, None] * proportions[None, :] * variation).astype(np.int64)
+
+def build_province_columns(occupations, counts, provinces):
+    province_names = list(provinces.keys())
+    populations = np.array([p['Population'] for p in provinces.values()], dtype=float)
+    per_10k = counts / populations[None, :] * 10000
+    
+    return {
+        'Province': province_names * len(counts),
+        'Occupation': np.repeat(np.asarray(occupations, dtype=object), len(province_names)).tolist(),
+        'Count': counts.ravel().tolist(),
+        'Per10K': per_10k.ravel().tolist()
+    }
+
+def get_province_data_path(filepath):
+    root, ext = os.path.splitext(filepath)
+    return f'{root}_provinces{ext}'
+
+def read_province_cube(df, provinces, province_path):
+    province_df = load_and_clean_data(province_path, count_columns=['Men', 'Women'])
+    cube = np.zeros((len(df), len(provinces), 2), dtype=np.int32)
+    occupation_rows = pd.Series(np.arange(len(df)), index=df['Occupation'].astype(str).to_numpy())
+    occupation_rows = occupation_rows[~occupation_rows.index.duplicated()]
+    rows = occupation_rows.reindex(province_df['Occupation'].astype(str).to_numpy()).fillna(-1).to_numpy(dtype=np.intp)
+    columns = pd.Index(list(provinces)).get_indexer(province_df['Province'].astype(str))
+    known = (rows >= 0) & (columns >= 0)
+    np.add.at(cube, (rows[known], columns[known], 0), province_df['Men'].to_numpy(dtype=np.int64)[known])
+    np.add.at(cube, (rows[known], columns[known], 1), province_df['Women'].to_numpy(dtype=np.int64)[known])
+    return cube
+
+def estimate_province_cube(df, provinces, seed):
+    cube = np.zeros((len(df), len(provinces), 2), dtype=np.int32)
+    if len(df):
+        counts = allocate_province_counts(df['Total'].to_numpy(), provinces, 0.8, 1.2, np.random.default_rng(seed))
+        men = df['Men'].to_numpy(dtype=float)
+        total = men + df['Women'].to_numpy(dtype=float)
+        men_share = np.divide(men, total, out=np.zeros_like(total), where=total > 0)
+        cube[..., 0] = np.rint(counts * men_share[:, None])
+        cube[..., 1] = counts - cube[..., 0]
+    return cube
+
+def build_province_cube(df, provinces, province_path=None, seed=0):
+    province_index = {name: i for i, name in enumerate(provinces)}
+    cube = None
+    if province_path and os.path.exists(province_path):
+        try:
+            cube = read_province_cube(df, provinces, province_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception('Failed to read province data from %s, using the estimated split', province_path)
+    if cube is None:
+        cube = estimate_province_cube(df, provinces, seed)
+    
+    cube.flags.writeable = False
+    return cube, province_index
+
+def get_province_counts(dataset, rows):
+    return dataset['province_cube'][rows].sum(axis=2)
+
+def get_dataset_version(filepath):
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def get_snapshot_path(filepath, version):
+    return os.path.join(f'{filepath}.snapshot', version)
+
+def write_snapshot(df, filepath, version):
+    snapshot_root = f'{filepath}.snapshot'
+    target = get_snapshot_path(filepath, version)
+    staging = f'{target}.{os.getpid()}.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    
+    columns = []
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            np.save(os.path.join(staging, f'{col}.npy'), df[col].to_numpy())
+            columns.append({'name': col, 'kind': 'numeric'})
+        else:
+            codes, table = pd.factorize(df[col])
+            np.save(os.path.join(staging, f'{col}.npy'), codes.astype(np.int32))
+            with open(os.path.join(staging, f'{col}.strings.json'), 'w', encoding='utf-8') as f:
+                json.dump([str(value) for value in table], f)
+            columns.append({'name': col, 'kind': 'string'})
+    np.save(os.path.join(staging, 'index.npy'), df.index.to_numpy())
+    
+    with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'rows': len(df), 'columns': columns}, f)
+    
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    for entry in os.scandir(snapshot_root):
+        if entry.path != target:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    return target
+
+def load_snapshot(filepath, version):
+    snapshot_path = get_snapshot_path(filepath, version)
+    try:
+        with open(os.path.join(snapshot_path, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != version:
+        return None
+    
+    data = {}
+    for column in manifest['columns']:
+        values = np.load(os.path.join(snapshot_path, f"{column['name']}.npy"), mmap_mode='r')
+        if column['kind'] == 'string':
+            with open(os.path.join(snapshot_path, f"{column['name']}.strings.json"), encoding='utf-8') as f:
+                values = pd.Categorical.from_codes(values, json.load(f))
+        data[column['name']] = values
+    index = np.load(os.path.join(snapshot_path, 'index.npy'))
+    return pd.DataFrame(data, index=index, copy=False)
+
+def build_empty_frame():
+    columns = {col: np.array([], dtype=np.int32) for col in COUNT_COLUMNS}
+    return pd.DataFrame({'Occupation': pd.Categorical([]), **columns})
+
+def load_dataset(filepath, chunksize=None):
+    version = get_dataset_version(filepath)
+    df = load_snapshot(filepath, version)
+    if df is None:
+        df = load_and_clean_data(filepath, chunksize=chunksize)
+    return df, version
+
+def build_snapshot(filepath, chunksize=None):
+    version = get_dataset_version(filepath)
+    return write_snapshot(load_and_clean_data(filepath, chunksize=chunksize), filepath, version)
+
+class FigureCache:
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.json')
+    
+    def get(self, key):
+        if self.directory:
+            payload = self._read_file(key)
+        else:
+            with self.lock:
+                payload = self.entries.get(key)
+                if payload is not None:
+                    self.entries.move_to_end(key)
+        with self.lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+    
+    def set(self, key, payload):
+        if len(payload) > self.max_bytes:
+            return
+        if self.directory:
+            self._write_file(key, payload)
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = payload
+            self.size += len(payload)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+    
+    def _read_file(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return payload
+    
+    def _write_file(self, key, payload):
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, oldest = entries.pop(0)
+            total -= size
+            try:
+                os.remove(oldest)
+            except OSError:
+                pass
+    
+    def contains(self, key):
+        if self.directory:
+            return os.path.exists(self._path(key))
+        with self.lock:
+            return key in self.entries
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        if self.directory:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json'):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+    
+    def stats(self):
+        if self.directory:
+            sizes = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json'):
+                    try:
+                        sizes.append(entry.stat().st_size)
+                    except OSError:
+                        continue
+        else:
+            with self.lock:
+                sizes = [len(payload) for payload in self.entries.values()]
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'file' if self.directory else 'memory',
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(sizes),
+                'bytes': sum(sizes)
+            }
+
+def normalize_callback_inputs(args):
+    normalized = []
+    for value in args:
+        if isinstance(value, (list, tuple)):
+            value = sorted(value, key=str)
+        normalized.append(value)
+    return normalized
+
+def freeze_arrays(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze_arrays(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze_arrays(item)
+
+#The frame itself is protected by pandas copy-on-write, so only the arrays the dataset owns are audited
+def find_writeable_arrays(value, path='dataset'):
+    if isinstance(value, np.ndarray):
+        if value.flags.writeable:
+            yield path
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from find_writeable_arrays(item, f'{path}[{key!r}]')
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            yield from find_writeable_arrays(item, f'{path}[{i}]')
+
+def build_dataset(df, version, province_path=None):
+    df = build_compact_frame(df)
+    noc_index = build_noc_index(df)
+    occupation_index = build_occupation_index(df)
+    seed = int(hashlib.sha1(version.encode()).hexdigest()[:8], 16)
+    province_cube, province_index = build_province_cube(df, provinces, province_path, seed)
+    dataset = {
+        'version': version,
+        'df': df,
+        'noc_index': noc_index,
+        'province_cube': province_cube,
+        'province_index': province_index,
+        'occupation_index': occupation_index,
+        'essential_services_rows': get_essential_services_rows(df, occupation_index),
+        'noc_top_level_rows': get_noc_level_rows(noc_index, 1),
+        'engineering_rows': get_engineering_rows(df, occupation_index),
+        'hierarchy_rollup': build_hierarchy_rollup(df, noc_index, occupation_index)
+    }
+    
+    freeze_arrays(dataset)
+    writeable = list(find_writeable_arrays(dataset))
+    if writeable:
+        logger.warning('Dataset %s shares writeable arrays across threads: %s', version, ', '.join(writeable))
+    return dataset
+
+class DatasetRegistry:
+    def __init__(self, filepath, poll_interval=10.0, chunksize=None):
+        self.filepath = filepath
+        self.province_path = get_province_data_path(filepath)
+        self.poll_interval = poll_interval
+        self.chunksize = chunksize
+        self.signature = self._signature()
+        self.lock = threading.Lock()
+        self.watcher = None
+        try:
+            df, version = load_dataset(filepath, self.chunksize)
+            version = self._version(version)
+        except:
+            df, version = build_empty_frame(), 'empty'
+        self.current = build_dataset(df, version, self.province_path)
+    
+    def _signature(self):
+        signature = []
+        for path in (self.filepath, self.province_path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+    
+    def _version(self, version):
+        if os.path.exists(self.province_path):
+            return f'{version}-{get_dataset_version(self.province_path)[:8]}'
+        return version
+    
+    def refresh(self):
+        signature = self._signature()
+        if signature[0] is None or signature == self.signature:
+            return False
+        with self.lock:
+            self.signature = signature
+            version = self._version(get_dataset_version(self.filepath))
+            if version == self.current['version']:
+                return False
+            df, version = load_dataset(self.filepath, self.chunksize)
+            version = self._version(version)
+            self.current = build_dataset(df, version, self.province_path)
+        logger.info('Loaded dataset version %s from %s', version, self.filepath)
+        return True
+    
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Failed to reload %s, keeping version %s', self.filepath, self.current['version'])
+    
+    def start_watching(self):
+        if self.poll_interval <= 0:
+            return
+        with self.lock:
+            if self.watcher is None or not self.watcher.is_alive():
+                self.watcher = threading.Thread(target=self._watch, name='dataset-watcher', daemon=True)
+                self.watcher.start()
+
+class CallbackMetrics:
+    DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.callbacks = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    def begin(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.local.started = now
+        self.local.last = now
+        self.local.phases = {}
+        self.local.cache_hit = None
+    
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        phases = self.local.phases
+        phases[phase] = phases.get(phase, 0.0) + now - self.local.last
+        self.local.last = now
+    
+    def cache_result(self, cache_hit):
+        if not self.enabled:
+            return
+        self.local.cache_hit = cache_hit
+    
+    def record(self, callback_name, result):
+        if not self.enabled:
+            return
+        duration = time.perf_counter() - self.local.started
+        phases = self.local.phases
+        cache = {True: 'hit', False: 'miss'}.get(self.local.cache_hit, 'none')
+        payload_bytes = len(serialize_figure(result))
+        with self.lock:
+            stats = self.callbacks.setdefault(callback_name, {
+                'calls': {},
+                'duration_sum': 0.0,
+                'duration_buckets': [0] * len(self.DURATION_BUCKETS),
+                'phases': {},
+                'payload_bytes': 0
+            })
+            stats['calls'][cache] = stats['calls'].get(cache, 0) + 1
+            stats['duration_sum'] += duration
+            for i, bound in enumerate(self.DURATION_BUCKETS):
+                if duration <= bound:
+                    stats['duration_buckets'][i] += 1
+            for phase, seconds in phases.items():
+                stats['phases'][phase] = stats['phases'].get(phase, 0.0) + seconds
+            stats['payload_bytes'] += payload_bytes
+        
+        if flask.has_request_context():
+            timings = flask.g.setdefault('server_timing', [])
+            timings.extend((f'{callback_name}.{phase}', seconds) for phase, seconds in phases.items())
+            timings.append((f'{callback_name}.{cache}', duration))
+    
+    def render(self, cache_stats, version):
+        lines = [
+            '# HELP dash_dataset_info Dataset version currently served.',
+            '# TYPE dash_dataset_info gauge',
+            f'dash_dataset_info{{version="{version}"}} 1',
+            '# HELP dash_figure_cache_lookups_total Figure cache lookups in this worker.',
+            '# TYPE dash_figure_cache_lookups_total counter',
+            f'dash_figure_cache_lookups_total{{result="hit"}} {cache_stats["hits"]}',
+            f'dash_figure_cache_lookups_total{{result="miss"}} {cache_stats["misses"]}',
+            '# HELP dash_figure_cache_bytes Size of cached figure JSON.',
+            '# TYPE dash_figure_cache_bytes gauge',
+            f'dash_figure_cache_bytes {cache_stats["bytes"]}',
+            '# HELP dash_figure_cache_entries Number of cached figures.',
+            '# TYPE dash_figure_cache_entries gauge',
+            f'dash_figure_cache_entries {cache_stats["entries"]}'
+        ]
+        
+        with self.lock:
+            callbacks = json.loads(json.dumps(self.callbacks))
+        
+        lines += [
+            '# HELP dash_callback_calls_total Callback invocations by figure cache result (none for uncached callbacks).',
+            '# TYPE dash_callback_calls_total counter'
+        ]
+        for name, stats in callbacks.items():
+            for result, count in stats['calls'].items():
+                lines.append(f'dash_callback_calls_total{{callback="{name}",cache="{result}"}} {count}')
+        
+        lines += [
+            '# HELP dash_callback_duration_seconds Wall time per callback invocation.',
+            '# TYPE dash_callback_duration_seconds histogram'
+        ]
+        for name, stats in callbacks.items():
+            for bound, count in zip(self.DURATION_BUCKETS, stats['duration_buckets']):
+                lines.append(f'dash_callback_duration_seconds_bucket{{callback="{name}",le="{bound}"}} {count}')
+            calls = sum(stats['calls'].values())
+            lines.append(f'dash_callback_duration_seconds_bucket{{callback="{name}",le="+Inf"}} {calls}')
+            lines.append(f'dash_callback_duration_seconds_sum{{callback="{name}"}} {stats["duration_sum"]}')
+            lines.append(f'dash_callback_duration_seconds_count{{callback="{name}"}} {calls}')
+        
+        lines += [
+            '# HELP dash_callback_phase_seconds_total Wall time per callback phase.',
+            '# TYPE dash_callback_phase_seconds_total counter'
+        ]
+        for name, stats in callbacks.items():
+            for phase, seconds in stats['phases'].items():
+                lines.append(f'dash_callback_phase_seconds_total{{callback="{name}",phase="{phase}"}} {seconds}')
+        
+        lines += [
+            '# HELP dash_callback_payload_bytes_total Serialized response bytes per callback.',
+            '# TYPE dash_callback_payload_bytes_total counter'
+        ]
+        for name, stats in callbacks.items():
+            lines.append(f'dash_callback_payload_bytes_total{{callback="{name}"}} {stats["payload_bytes"]}')
+        
+        return '\n'.join(lines) + '\n'
+
+def build_bar_template():
+    base = pio.templates['plotly'].to_plotly_json()
+    layout_keys = ['autotypenumbers', 'colorway', 'font', 'hovermode', 'hoverlabel', 'paper_bgcolor',
+                   'plot_bgcolor', 'xaxis', 'yaxis', 'shapedefaults', 'title']
+    return go.layout.Template(
+        layout={key: base['layout'][key] for key in layout_keys if key in base['layout']},
+        data={'bar': base['data']['bar']}
+    )
+
+def get_bar_colors(count):
+    colorway = BAR_TEMPLATE.layout.colorway
+    return [colorway[i % len(colorway)] for i in range(count)]
+
+def is_triggered_by(component_id):
+    try:
+        return len(dash.ctx.triggered_prop_ids) == 1 and dash.ctx.triggered_id == component_id
+    except (MissingCallbackContextException, LookupError):
+        return False
+
+def patch_figure_data(figure, layout_keys=()):
+    patch = Patch()
+    patch['data'] = figure['data']
+    for key in layout_keys:
+        patch['layout'][key] = figure['layout'].get(key)
+    return patch
+
+def get_figure_key(name, args, version):
+    return json.dumps([name, normalize_callback_inputs(args), version], default=str)
+
+def serialize_figure(result):
+    if isinstance(result, go.Figure):
+        return result.to_json()
+    return json.dumps(result, cls=plotly.utils.PlotlyJSONEncoder)
+
+def timed_callback(callback):
+    @functools.wraps(callback)
+    def wrapper(*args):
+        metrics.begin()
+        result = callback(*args)
+        metrics.record(callback.__name__, result)
+        return result
+    return wrapper
+
+def cached_figure(callback):
+    @functools.wraps(callback)
+    def wrapper(*args):
+        dataset = registry.current
+        key = get_figure_key(callback.__name__, args, dataset['version'])
+        payload = figure_cache.get(key)
+        metrics.cache_result(payload is not None)
+        if payload is None:
+            result = callback(dataset, *args)
+            metrics.lap('figure')
+            payload = serialize_figure(result)
+            metrics.lap('serialize')
+            figure_cache.set(key, payload)
+        return json.loads(payload)
+    return wrapper
+
+def iter_warmup_inputs(dataset):
+    default_nocs = pd.unique(get_occupation_names(dataset['df'], dataset['noc_top_level_rows']))[:3].tolist()
+    
+    for service_type in SERVICE_TYPES:
+        yield 'update_essential_services_graph', (service_type,)
+    
+    for selected_nocs, chart_type in itertools.product([default_nocs, []], ['stack', 'group', 'ratio']):
+        yield 'build_gender_employment_figure', (selected_nocs, chart_type)
+    
+    for size in range(len(ENGINEERING_TYPES) + 1):
+        for selected_types in itertools.combinations(ENGINEERING_TYPES, size):
+            yield 'update_engineering_manpower_graph', (list(selected_types),)
+    
+    for category, analysis_type in itertools.product(OCCUPATION_CATEGORIES, ['hierarchy', 'parity']):
+        yield 'build_custom_insight_figure', (category, analysis_type)
+
+def render_warmup_figure(name, args, version):
+    dataset = registry.current
+    if dataset['version'] != version and registry.refresh():
+        dataset = registry.current
+    if dataset['version'] != version:
+        return None
+    metrics.begin()
+    return serialize_figure(inspect.unwrap(globals()[name])(dataset, *args))
+
+class FigureWarmup:
+    def __init__(self, processes=2):
+        self.processes = processes
+        self.version = None
+        self.thread = None
+        self.completed = 0
+        self.total = 0
+        self.lock = threading.Lock()
+    
+    def start(self, dataset):
+        if self.processes <= 0 or self.version == dataset['version']:
+            return
+        with self.lock:
+            if self.version == dataset['version']:
+                return
+            self.version = dataset['version']
+            self.thread = threading.Thread(target=self.run, args=(dataset,), name='figure-warmup', daemon=True)
+            self.thread.start()
+    
+    def run(self, dataset):
+        version = self.version = dataset['version']
+        jobs = []
+        for name, args in iter_warmup_inputs(dataset):
+            key = get_figure_key(name, args, version)
+            if not figure_cache.contains(key):
+                jobs.append((key, name, args))
+        self.completed, self.total = 0, len(jobs)
+        if not jobs:
+            return
+        
+        started = time.perf_counter()
+        try:
+            #Spawn rather than fork, since forking a threaded worker can deadlock, and the processes exit with the pool
+            with ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(render_warmup_figure, name, args, version) for _, name, args in jobs]
+                for (key, _, _), future in zip(jobs, futures):
+                    payload = future.result()
+                    if registry.current['version'] != version:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return
+                    if payload is not None:
+                        figure_cache.set(key, payload)
+                    self.completed += 1
+        except Exception:
+            logger.exception('Figure warm-up failed for version %s', version)
+            return
+        logger.info('Warmed %d figures for version %s in %.2fs', self.completed, version, time.perf_counter() - started)
+    
+    def stats(self):
+        return {
+            'version': self.version,
+            'running': self.thread is not None and self.thread.is_alive(),
+            'completed': self.completed,
+            'total': self.total
+        }
 
 provinces = get_province_data()
-essential_services_df = get_essential_services_data(df)
-noc_top_level_df = get_noc_top_level_data(df)
-engineering_df = get_engineering_data(df)
+
+DATA_PATH = os.environ.get('DATA_PATH', 'data.csv')
+OCCUPATION_SEARCH_LIMIT = 20
+CALLBACK_RECORD_PATH = os.environ.get('CALLBACK_RECORD_PATH')
+BAR_TEMPLATE = build_bar_template()
+
+registry = DatasetRegistry(
+    DATA_PATH,
+    poll_interval=float(os.environ.get('DATASET_POLL_INTERVAL', 10)),
+    chunksize=int(os.environ.get('INGEST_CHUNKSIZE', 100_000))
+)
+
+callback_record_lock = threading.Lock()
+
+metrics = CallbackMetrics(enabled=os.environ.get('CALLBACK_METRICS', '0') == '1')
+
+figure_cache = FigureCache(
+    max_entries=int(os.environ.get('FIGURE_CACHE_MAX_ENTRIES', 512)),
+    max_bytes=int(os.environ.get('FIGURE_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+    directory=os.environ.get('FIGURE_CACHE_DIR')
+)
+
+figure_warmup = FigureWarmup(processes=int(os.environ.get('FIGURE_WARMUP_PROCESSES', 2)))
+
 
 app = dash.Dash(
     __name__, 
@@ -71,475 +1151,678 @@ app = dash.Dash(
 )
 server = app.server
 
-app.layout = dbc.Container([
-    dbc.Row([
-        dbc.Col([
-            html.H1("2023 Canadian Employment Data Dashboard", className="text-center"),
-            html.P("Interactive visualization of employment statistics", className="text-center")
-        ], width=12)
-    ], className="mt-4 mb-4"),
-    
-    dbc.Tabs([
-        dbc.Tab(label="Essential Services", children=[
-            dbc.Row([
-                dbc.Col([
-                    html.H3("Essential Services Distribution", className="mt-3"),
-                    html.P("Police, firefighters, and nurses across provinces")
-                ], width=12)
-            ]),
-            
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Select Service:"),
-                    dcc.Dropdown(
-                        id="service-type-dropdown",
-                        options=[
-                            {"label": "All Essential Services", "value": "all"},
-                            {"label": "Police Officers", "value": "police"},
-                            {"label": "Firefighters", "value": "fire"},
-                            {"label": "Registered Nurses", "value": "nurse"}
-                        ],
-                        value="all",
-                        clearable=False
-                    )
-                ], width=4),
-                
-                dbc.Col([
-                    html.Label("View Mode:"),
-                    dcc.RadioItems(
-                        id="normalization-radio",
-                        options=[
-                            {"label": "Absolute Numbers", "value": "absolute"},
-                            {"label": "Per 10,000 Population", "value": "normalized"}
-                        ],
-                        value="absolute",
-                        inline=True
-                    )
-                ], width=4),
-                
-                dbc.Col([
-                    html.Label("Sort By:"),
-                    dcc.Dropdown(
-                        id="sort-dropdown",
-                        options=[
-                            {"label": "Province (A-Z)", "value": "province"},
-                            {"label": "Count (High-Low)", "value": "count_desc"},
-                            {"label": "Count (Low-High)", "value": "count_asc"}
-                        ],
-                        value="count_desc",
-                        clearable=False
-                    )
-                ], width=4)
-            ], className="mb-4"),
-            
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(id="essential-services-graph")
-                ], width=12)
-            ])
+@server.before_request
+def ensure_dataset_watcher():
+    if registry.watcher is None or not registry.watcher.is_alive():
+        registry.start_watching()
+
+@server.before_request
+def ensure_figure_warmup():
+    figure_warmup.start(registry.current)
+
+@server.before_request
+def record_callback_request():
+    if CALLBACK_RECORD_PATH and flask.request.method == 'POST' and flask.request.path.endswith('_dash-update-component'):
+        line = json.dumps(flask.request.get_json(silent=True)) + '\n'
+        with callback_record_lock, open(CALLBACK_RECORD_PATH, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+@server.after_request
+def add_server_timing(response):
+    timings = flask.g.pop('server_timing', None)
+    if timings and flask.request.path.endswith('_dash-update-component'):
+        response.headers['Server-Timing'] = ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in timings)
+    return response
+
+@server.route('/cache-stats')
+def cache_stats():
+    return dict(figure_cache.stats(), warmup=figure_warmup.stats())
+
+@server.route('/api/occupations/search')
+def occupation_search_endpoint():
+    query = flask.request.args.get('q', '')
+    limit = max(1, min(flask.request.args.get('limit', OCCUPATION_SEARCH_LIMIT, type=int), 100))
+    return {'results': search_occupations(registry.current['occupation_index'], query, limit)}
+
+@server.route('/api/occupations')
+def occupations_export_endpoint():
+    dataset = registry.current
+    export_format = flask.request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return {'error': f"format must be one of {list(EXPORT_FORMATS)}"}, 400
+    if export_format == 'arrow' and pa is None:
+        return {'error': 'Arrow export requires pyarrow to be installed'}, 501
+    
+    etag = get_export_etag(dataset['version'], export_format, flask.request.args)
+    if flask.request.if_none_match.contains(etag):
+        response = flask.Response(status=304)
+    else:
+        try:
+            rows = get_export_rows(dataset, flask.request.args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        mimetype, stream = EXPORT_FORMATS[export_format]
+        response = flask.Response(stream(dataset['df'], rows), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename=occupations.{export_format}'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@server.route('/metrics')
+def metrics_endpoint():
+    body = metrics.render(figure_cache.stats(), registry.current['version'])
+    return flask.Response(body, mimetype='text/plain; version=0.0.4')
+
+def build_essential_services_tab(dataset):
+    return [
+        dbc.Row([
+            dbc.Col([
+                html.H3("Essential Services Distribution", className="mt-3"),
+                html.P("Police, firefighters, and nurses across provinces")
+            ], width=12)
         ]),
+    
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Service:"),
+                dcc.Dropdown(
+                    id="service-type-dropdown",
+                    options=[
+                        {"label": "All Essential Services", "value": "all"},
+                        {"label": "Police Officers", "value": "police"},
+                        {"label": "Firefighters", "value": "fire"},
+                        {"label": "Registered Nurses", "value": "nurse"}
+                    ],
+                    value="all",
+                    persistence=True,
+                    persistence_type="memory",
+                    clearable=False
+                )
+            ], width=4),
+        
+            dbc.Col([
+                html.Label("View Mode:"),
+                dcc.RadioItems(
+                    id="normalization-radio",
+                    options=[
+                        {"label": "Absolute Numbers", "value": "absolute"},
+                        {"label": "Per 10,000 Population", "value": "normalized"}
+                    ],
+                    value="absolute",
+                    persistence=True,
+                    persistence_type="memory",
+                    inline=True
+                )
+            ], width=4),
         
-        dbc.Tab(label="Gender Employment", children=[
-            dbc.Row([
-                dbc.Col([
-                    html.H3("Gender Employment Statistics", className="mt-3"),
-                    html.P("Top-level NOC category employment by gender")
-                ], width=12)
-            ]),
-            
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Select NOC Categories:"),
-                    dcc.Dropdown(
-                        id="noc-dropdown",
-                        options=[{"label": occ, "value": occ} for occ in noc_top_level_df['Occupation'].unique()],
-                        value=noc_top_level_df['Occupation'].unique()[:3].tolist(),
-                        multi=True
-                    )
-                ], width=6),
-                
-                dbc.Col([
-                    html.Label("Chart Type:"),
-                    dcc.RadioItems(
-                        id="chart-type-radio",
-                        options=[
-                            {"label": "Stacked Bar", "value": "stack"},
-                            {"label": "Grouped Bar", "value": "group"},
-                            {"label": "Gender Ratio", "value": "ratio"}
-                        ],
-                        value="stack",
-                        inline=True
-                    )
-                ], width=6)
-            ], className="mb-4"),
-            
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(id="gender-employment-graph")
-                ], width=12)
-            ])
+            dbc.Col([
+                html.Label("Sort By:"),
+                dcc.Dropdown(
+                    id="sort-dropdown",
+                    options=[
+                        {"label": "Province (A-Z)", "value": "province"},
+                        {"label": "Count (High-Low)", "value": "count_desc"},
+                        {"label": "Count (Low-High)", "value": "count_asc"}
+                    ],
+                    value="count_desc",
+                    persistence=True,
+                    persistence_type="memory",
+                    clearable=False
+                )
+            ], width=4)
+        ], className="mb-4"),
+    
+        dbc.Row([
+            dbc.Col([
+                dcc.Store(id="essential-services-data"),
+                dcc.Graph(id="essential-services-graph")
+            ], width=12)
+        ])
+    ]
+
+def build_gender_employment_tab(dataset):
+    noc_top_level = pd.unique(get_occupation_names(dataset['df'], dataset['noc_top_level_rows']))
+    
+    return [
+        dbc.Row([
+            dbc.Col([
+                html.H3("Gender Employment Statistics", className="mt-3"),
+                html.P("Top-level NOC category employment by gender")
+            ], width=12)
         ]),
+    
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select NOC Categories:"),
+                dcc.Dropdown(
+                    id="noc-dropdown",
+                    options=[{"label": occ, "value": occ} for occ in noc_top_level[:OCCUPATION_SEARCH_LIMIT]],
+                    value=noc_top_level[:3].tolist(),
+                    persistence=True,
+                    persistence_type="memory",
+                    placeholder="Type an occupation or NOC code...",
+                    multi=True
+                )
+            ], width=6),
         
-        dbc.Tab(label="Engineering Workforce", children=[
-            dbc.Row([
-                dbc.Col([
-                    html.H3("Engineering Workforce", className="mt-3"),
-                    html.P("Computer, mechanical, and electrical engineers by province")
-                ], width=12)
-            ]),
-            
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Engineering Types:"),
-                    dcc.Checklist(
-                        id="engineering-checklist",
-                        options=[
-                            {"label": "Computer Engineers", "value": "computer"},
-                            {"label": "Mechanical Engineers", "value": "mechanical"},
-                            {"label": "Electrical Engineers", "value": "electrical"}
-                        ],
-                        value=["computer", "mechanical", "electrical"],
-                        inline=True
-                    )
-                ], width=6),
-                
-                dbc.Col([
-                    html.Label("View Mode:"),
-                    dcc.RadioItems(
-                        id="engineering-view-radio",
-                        options=[
-                            {"label": "Absolute Numbers", "value": "absolute"},
-                            {"label": "Per 10,000 Population", "value": "per_capita"}
-                        ],
-                        value="absolute",
-                        inline=True
-                    )
-                ], width=6)
-            ], className="mb-4"),
-            
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(id="engineering-manpower-graph")
-                ], width=12)
-            ])
+            dbc.Col([
+                html.Label("Chart Type:"),
+                dcc.RadioItems(
+                    id="chart-type-radio",
+                    options=[
+                        {"label": "Stacked Bar", "value": "stack"},
+                        {"label": "Grouped Bar", "value": "group"},
+                        {"label": "Gender Ratio", "value": "ratio"}
+                    ],
+                    value="stack",
+                    persistence=True,
+                    persistence_type="memory",
+                    inline=True
+                )
+            ], width=6)
+        ], className="mb-4"),
+    
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id="gender-employment-graph")
+            ], width=12)
+        ])
+    ]
+
+def build_engineering_workforce_tab(dataset):
+    return [
+        dbc.Row([
+            dbc.Col([
+                html.H3("Engineering Workforce", className="mt-3"),
+                html.P("Computer, mechanical, and electrical engineers by province")
+            ], width=12)
         ]),
+    
+        dbc.Row([
+            dbc.Col([
+                html.Label("Engineering Types:"),
+                dcc.Checklist(
+                    id="engineering-checklist",
+                    options=[
+                        {"label": "Computer Engineers", "value": "computer"},
+                        {"label": "Mechanical Engineers", "value": "mechanical"},
+                        {"label": "Electrical Engineers", "value": "electrical"}
+                    ],
+                    value=["computer", "mechanical", "electrical"],
+                    persistence=True,
+                    persistence_type="memory",
+                    inline=True
+                )
+            ], width=6),
         
-        dbc.Tab(label="Custom Insight", children=[
-            dbc.Row([
-                dbc.Col([
-                    html.H3("Occupation Hierarchy Analysis", className="mt-3"),
-                    html.P("Gender distribution across occupation levels")
-                ], width=12)
-            ]),
-            
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Select Category:"),
-                    dcc.Dropdown(
-                        id="occupation-category-dropdown",
-                        options=[
-                            {"label": "Business & Finance", "value": "business"},
-                            {"label": "Sciences & Engineering", "value": "science"},
-                            {"label": "Health", "value": "health"},
-                            {"label": "Education & Law", "value": "education"},
-                            {"label": "Art & Culture", "value": "art"}
-                        ],
-                        value="science",
-                        clearable=False
-                    )
-                ], width=6),
-                
-                dbc.Col([
-                    html.Label("Analysis Type:"),
-                    dcc.RadioItems(
-                        id="analysis-type-radio",
-                        options=[
-                            {"label": "Hierarchy Level", "value": "hierarchy"},
-                            {"label": "Gender Parity", "value": "parity"}
-                        ],
-                        value="hierarchy",
-                        inline=True
-                    )
-                ], width=6)
-            ], className="mb-4"),
-            
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(id="custom-insight-graph")
-                ], width=12)
-            ])
+            dbc.Col([
+                html.Label("View Mode:"),
+                dcc.RadioItems(
+                    id="engineering-view-radio",
+                    options=[
+                        {"label": "Absolute Numbers", "value": "absolute"},
+                        {"label": "Per 10,000 Population", "value": "per_capita"}
+                    ],
+                    value="absolute",
+                    persistence=True,
+                    persistence_type="memory",
+                    inline=True
+                )
+            ], width=6)
+        ], className="mb-4"),
+    
+        dbc.Row([
+            dbc.Col([
+                dcc.Store(id="engineering-manpower-data"),
+                dcc.Graph(id="engineering-manpower-graph")
+            ], width=12)
         ])
-    ]),
+    ]
+
+def build_custom_insight_tab(dataset):
+    return [
+        dbc.Row([
+            dbc.Col([
+                html.H3("Occupation Hierarchy Analysis", className="mt-3"),
+                html.P("Gender distribution across occupation levels")
+            ], width=12)
+        ]),
     
-    html.Footer([
-        html.P("Data Source: 2023 Statistics Canada Census", className="text-center mt-4 text-muted")
-    ])
-], fluid=True)
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Category:"),
+                dcc.Dropdown(
+                    id="occupation-category-dropdown",
+                    options=[
+                        {"label": "Business & Finance", "value": "business"},
+                        {"label": "Sciences & Engineering", "value": "science"},
+                        {"label": "Health", "value": "health"},
+                        {"label": "Education & Law", "value": "education"},
+                        {"label": "Art & Culture", "value": "art"}
+                    ],
+                    value="science",
+                    persistence=True,
+                    persistence_type="memory",
+                    clearable=False
+                )
+            ], width=6),
+        
+            dbc.Col([
+                html.Label("Analysis Type:"),
+                dcc.RadioItems(
+                    id="analysis-type-radio",
+                    options=[
+                        {"label": "Hierarchy Level", "value": "hierarchy"},
+                        {"label": "Gender Parity", "value": "parity"}
+                    ],
+                    value="hierarchy",
+                    persistence=True,
+                    persistence_type="memory",
+                    inline=True
+                )
+            ], width=6)
+        ], className="mb-4"),
+    
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id="custom-insight-graph")
+            ], width=12)
+        ])
+    ]
+
+TABS = {
+    "essential-services": ("Essential Services", build_essential_services_tab),
+    "gender-employment": ("Gender Employment", build_gender_employment_tab),
+    "engineering-workforce": ("Engineering Workforce", build_engineering_workforce_tab),
+    "custom-insight": ("Custom Insight", build_custom_insight_tab)
+}
+DEFAULT_TAB = "essential-services"
+
+def serve_layout():
+    dataset = registry.current
+    
+    return dbc.Container([
+        dcc.Store(id="figure-template", data=BAR_TEMPLATE.to_plotly_json()),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H1("2023 Canadian Employment Data Dashboard", className="text-center"),
+                html.P("Interactive visualization of employment statistics", className="text-center")
+            ], width=12)
+        ], className="mt-4 mb-4"),
+    
+        dbc.Tabs(
+            id="dashboard-tabs",
+            active_tab=DEFAULT_TAB,
+            children=[dbc.Tab(label=label, tab_id=tab_id) for tab_id, (label, _) in TABS.items()]
+        ),
+        html.Div(id="tab-content", children=TABS[DEFAULT_TAB][1](dataset)),
+    
+        html.Footer([
+            html.P("Data Source: 2023 Statistics Canada Census", className="text-center mt-4 text-muted")
+        ])
+    ], fluid=True)
+
+app.layout = serve_layout
+app.validation_layout = html.Div(
+    [serve_layout()] + [html.Div(builder(registry.current)) for tab_id, (_, builder) in TABS.items() if tab_id != DEFAULT_TAB]
+)
 
 @app.callback(
-    Output("essential-services-graph", "figure"),
-    [
-        Input("service-type-dropdown", "value"),
-        Input("normalization-radio", "value"),
-        Input("sort-dropdown", "value")
-    ]
+    Output("tab-content", "children"),
+    Input("dashboard-tabs", "active_tab"),
+    prevent_initial_call=True
 )
-def update_essential_services_graph(service_type, normalization, sort_by):
-    if service_type == "all":
-        filtered_df = essential_services_df.copy()
-    elif service_type == "police":
-        filtered_df = essential_services_df[essential_services_df['Occupation'].str.contains('police', case=False, na=False)]
-    elif service_type == "fire":
-        filtered_df = essential_services_df[essential_services_df['Occupation'].str.contains('fire', case=False, na=False)]
-    elif service_type == "nurse":
-        filtered_df = essential_services_df[essential_services_df['Occupation'].str.contains('nurse', case=False, na=False)]
-    
-    provinces_list = list(provinces.keys())
-    province_data = []
-    
-    for occ in filtered_df['Occupation'].unique():
-        total = filtered_df[filtered_df['Occupation'] == occ]['Total'].iloc[0]
-        for province in provinces_list:
-            pop_proportion = provinces[province]['Population'] / sum([p['Population'] for p in provinces.values()])
-            variation = np.random.uniform(0.7, 1.3)
-            province_value = int(total * pop_proportion * variation)
-            
-            province_data.append({
-                'Province': province,
-                'Occupation': occ,
-                'Count': province_value,
-                'Per10K': (province_value / provinces[province]['Population']) * 10000
-            })
+@timed_callback
+def render_tab(active_tab):
+    _, builder = TABS.get(active_tab, TABS[DEFAULT_TAB])
+    return builder(registry.current)
+
+@app.callback(
+    Output("essential-services-data", "data"),
+    Input("service-type-dropdown", "value")
+)
+@timed_callback
+@cached_figure
+def update_essential_services_graph(dataset, service_type):
+    df = dataset['df']
+    rows = get_service_type_rows(dataset, service_type)
+    metrics.lap('filter')
     
-    province_df = pd.DataFrame(province_data)
+    rows = get_unique_occupation_rows(df, rows)
+    counts = get_province_counts(dataset, rows)
     
     if service_type == "all":
-        province_df = province_df.groupby('Province').agg({
-            'Count': 'sum',
-            'Per10K': 'sum'
-        }).reset_index()
-    
-    y_column = 'Per10K' if normalization == 'normalized' else 'Count'
-    y_title = 'Personnel per 10,000 Population' if normalization == 'normalized' else 'Number of Personnel'
-    
-    if sort_by == 'province':
-        province_df = province_df.sort_values('Province')
-    elif sort_by == 'count_desc':
-        province_df = province_df.sort_values(y_column, ascending=False)
+        province_columns = build_province_columns(['All'], counts.sum(axis=0, keepdims=True), provinces)
     else:
-        province_df = province_df.sort_values(y_column, ascending=True)
+        province_columns = build_province_columns(get_occupation_names(df, rows), counts, provinces)
+    metrics.lap('frame')
     
-    fig = px.bar(
-        province_df,
-        x='Province',
-        y=y_column,
-        color='Province',
+    layout = go.Layout(
         title=f'Essential Services Distribution ({service_type.title()})',
-        labels={'Province': 'Province/Territory', y_column: y_title}
-    )
-    
-    fig.update_layout(
+        xaxis_title='Province/Territory',
         xaxis_tickangle=-45,
-        legend_title="Province/Territory",
+        barmode='relative',
         height=600
     )
     
-    return fig
+    return {
+        'layout': layout.to_plotly_json(),
+        'y_titles': {'Count': 'Number of Personnel', 'Per10K': 'Personnel per 10,000 Population'},
+        'Province': province_columns['Province'],
+        'Count': province_columns['Count'],
+        'Per10K': province_columns['Per10K']
+    }
 
-@app.callback(
-    Output("gender-employment-graph", "figure"),
+app.clientside_callback(
+    """
+    function(data, normalization, sortBy, template) {
+        if (!data) {
+            return window.dash_clientside.no_update;
+        }
+        var column = normalization === 'normalized' ? 'Per10K' : 'Count';
+        var yTitle = data.y_titles[column];
+        var colorway = template.layout.colorway;
+        var provinceColors = {};
+        data.Province.forEach(function(province) {
+            if (!(province in provinceColors)) {
+                provinceColors[province] = colorway[Object.keys(provinceColors).length % colorway.length];
+            }
+        });
+        
+        var rows = data.Province.map(function(province, i) {
+            return {province: province, value: data[column][i]};
+        });
+        if (sortBy === 'province') {
+            rows.sort(function(a, b) { return a.province.localeCompare(b.province); });
+        } else if (sortBy === 'count_desc') {
+            rows.sort(function(a, b) { return b.value - a.value; });
+        } else {
+            rows.sort(function(a, b) { return a.value - b.value; });
+        }
+        
+        var trace = {
+            type: 'bar',
+            showlegend: false,
+            hovertemplate: 'Province/Territory=%{x}<br>' + yTitle + '=%{y}<extra></extra>',
+            x: rows.map(function(row) { return row.province; }),
+            y: rows.map(function(row) { return row.value; }),
+            marker: {color: rows.map(function(row) { return provinceColors[row.province]; })}
+        };
+        
+        var layout = Object.assign({}, data.layout, {template: template});
+        layout.yaxis = Object.assign({}, layout.yaxis, {title: {text: yTitle}});
+        return {data: [trace], layout: layout};
+    }
+    """,
+    Output("essential-services-graph", "figure"),
     [
-        Input("noc-dropdown", "value"),
-        Input("chart-type-radio", "value")
-    ]
+        Input("essential-services-data", "data"),
+        Input("normalization-radio", "value"),
+        Input("sort-dropdown", "value")
+    ],
+    State("figure-template", "data")
 )
-def update_gender_employment_graph(selected_nocs, chart_type):
+
+@app.callback(
+    Output("noc-dropdown", "options"),
+    Input("noc-dropdown", "search_value"),
+    State("noc-dropdown", "value"),
+    prevent_initial_call=True
+)
+@timed_callback
+def update_noc_options(search_value, selected_nocs):
+    if not search_value:
+        raise PreventUpdate
+    
+    selected_nocs = selected_nocs or []
+    matches = search_occupations(registry.current['occupation_index'], search_value, OCCUPATION_SEARCH_LIMIT)
+    return [{"label": occ, "value": occ} for occ in selected_nocs + [m for m in matches if m not in selected_nocs]]
+
+@cached_figure
+def build_gender_employment_figure(dataset, selected_nocs, chart_type):
+    df = dataset['df']
+    
     if not selected_nocs:
-        selected_nocs = noc_top_level_df['Occupation'].unique()[:3].tolist()
+        selected_nocs = pd.unique(get_occupation_names(df, dataset['noc_top_level_rows']))[:3].tolist()
     
-    filtered_df = noc_top_level_df[noc_top_level_df['Occupation'].isin(selected_nocs)]
+    rows = get_occupation_rows(dataset['occupation_index'], selected_nocs)
+    occupations = get_occupation_names(df, rows)
+    metrics.lap('filter')
     
     if chart_type == "ratio":
-        filtered_df = filtered_df.copy()
-        filtered_df['Ratio'] = filtered_df['Men'] / filtered_df['Women']
-        
-        fig = px.bar(
-            filtered_df,
-            x='Occupation',
-            y='Ratio',
-            color='Occupation',
-            title='Gender Ratio (Men/Women) by NOC Category',
-            labels={'Occupation': 'NOC Category', 'Ratio': 'Men/Women Ratio'}
+        ratio = get_ratio_metric(df, rows, 'men_to_women')
+        metrics.lap('frame')
+        
+        fig = go.Figure(
+            data=[go.Bar(
+                x=occupations,
+                y=ratio,
+                marker_color=get_bar_colors(len(occupations)),
+                showlegend=False,
+                hovertemplate='NOC Category=%{x}<br>Men/Women Ratio=%{y}<extra></extra>'
+            )],
+            layout=go.Layout(
+                template=BAR_TEMPLATE,
+                title='Gender Ratio (Men/Women) by NOC Category',
+                xaxis_title='NOC Category',
+                yaxis_title='Men/Women Ratio',
+                height=600
+            )
         )
         
         fig.add_shape(
             type="line",
             x0=-0.5,
             y0=1,
-            x1=len(filtered_df) - 0.5,
+            x1=len(rows) - 0.5,
             y1=1,
             line=dict(color="red", width=2, dash="dash"),
         )
         
     else:
-        df_long = pd.melt(
-            filtered_df,
-            id_vars=['Occupation'],
-            value_vars=['Men', 'Women'],
-            var_name='Gender',
-            value_name='Count'
-        )
+        counts = {gender: df[gender].to_numpy()[rows] for gender in ['Men', 'Women']}
+        metrics.lap('frame')
         
         barmode = 'group' if chart_type == "group" else 'stack'
         
-        fig = px.bar(
-            df_long,
-            x='Occupation',
-            y='Count',
-            color='Gender',
-            barmode=barmode,
-            title='Employment by Gender and NOC Category',
-            labels={'Occupation': 'NOC Category', 'Count': 'Number of Employed Persons'}
+        fig = go.Figure(
+            data=[
+                go.Bar(
+                    x=occupations,
+                    y=counts[gender],
+                    name=gender,
+                    hovertemplate=f'Gender={gender}<br>NOC Category=%{{x}}<br>Number of Employed Persons=%{{y}}<extra></extra>'
+                )
+                for gender in ['Men', 'Women']
+            ],
+            layout=go.Layout(
+                template=BAR_TEMPLATE,
+                title='Employment by Gender and NOC Category',
+                xaxis_title='NOC Category',
+                yaxis_title='Number of Employed Persons',
+                legend_title='Gender',
+                barmode=barmode,
+                height=600
+            )
         )
     
-    fig.update_layout(height=600)
     return fig
 
 @app.callback(
-    Output("engineering-manpower-graph", "figure"),
+    Output("gender-employment-graph", "figure"),
     [
-        Input("engineering-checklist", "value"),
-        Input("engineering-view-radio", "value")
+        Input("noc-dropdown", "value"),
+        Input("chart-type-radio", "value")
     ]
 )
-def update_engineering_manpower_graph(selected_types, view_type):
-    if not selected_types:
-        selected_types = ["computer", "mechanical", "electrical"]
-    
-    engineering_filters = []
-    if "computer" in selected_types:
-        engineering_filters.append("computer")
-    if "mechanical" in selected_types:
-        engineering_filters.append("mechanical")
-    if "electrical" in selected_types:
-        engineering_filters.append("electrical")
-    
-    filtered_df = engineering_df[
-        engineering_df['Occupation'].str.contains('|'.join(engineering_filters), case=False, na=False)
-    ]
-    
-    provinces_list = list(provinces.keys())
-    province_data = []
-    
-    for occ in filtered_df['Occupation'].unique():
-        total = filtered_df[filtered_df['Occupation'] == occ]['Total'].iloc[0]
-        for province in provinces_list:
-            pop_proportion = provinces[province]['Population'] / sum([p['Population'] for p in provinces.values()])
-            variation = np.random.uniform(0.8, 1.2)
-            province_value = int(total * pop_proportion * variation)
-            
-            engineer_type = "Computer" if "computer" in occ.lower() else "Mechanical" if "mechanical" in occ.lower() else "Electrical"
-            
-            province_data.append({
-                'Province': province,
-                'EngineerType': engineer_type,
-                'Count': province_value,
-                'Per10K': (province_value / provinces[province]['Population']) * 10000
-            })
-    
-    province_df = pd.DataFrame(province_data)
+@timed_callback
+def update_gender_employment_graph(selected_nocs, chart_type):
+    figure = build_gender_employment_figure(selected_nocs, chart_type)
+    if is_triggered_by("noc-dropdown"):
+        return patch_figure_data(figure, ['shapes'])
+    return figure
+
+@app.callback(
+    Output("engineering-manpower-data", "data"),
+    Input("engineering-checklist", "value")
+)
+@timed_callback
+@cached_figure
+def update_engineering_manpower_graph(dataset, selected_types):
+    df = dataset['df']
+    rows = get_engineering_type_rows(dataset, selected_types or ENGINEERING_TYPES)
+    metrics.lap('filter')
     
-    y_column = 'Per10K' if view_type == 'per_capita' else 'Count'
-    y_title = 'Engineers per 10,000 Population' if view_type == 'per_capita' else 'Number of Engineers'
+    rows = get_unique_occupation_rows(df, rows)
+    occupation_names = get_occupation_names(df, rows)
+    province_columns = build_province_columns(occupation_names, get_province_counts(dataset, rows), provinces)
     
-    fig = px.bar(
-        province_df,
-        x='Province',
-        y=y_column,
-        color='EngineerType',
-        barmode='group',
-        title='Engineering Workforce by Province',
-        labels={'Province': 'Province/Territory', y_column: y_title, 'EngineerType': 'Engineer Type'}
+    occupation_names = pd.Series(occupation_names, dtype=object).str.lower()
+    engineer_types = np.select(
+        [occupation_names.str.contains('computer'), occupation_names.str.contains('mechanical')],
+        ['Computer', 'Mechanical'],
+        'Electrical'
     )
+    metrics.lap('frame')
     
-    fig.update_layout(
+    layout = go.Layout(
+        title='Engineering Workforce by Province',
+        xaxis_title='Province/Territory',
         xaxis_tickangle=-45,
+        legend_title='Engineer Type',
+        barmode='group',
         height=600
     )
     
-    return fig
+    return {
+        'layout': layout.to_plotly_json(),
+        'y_titles': {'Count': 'Number of Engineers', 'Per10K': 'Engineers per 10,000 Population'},
+        'Province': province_columns['Province'],
+        'EngineerType': np.repeat(engineer_types, len(provinces)).tolist(),
+        'Count': province_columns['Count'],
+        'Per10K': province_columns['Per10K']
+    }
 
-@app.callback(
-    Output("custom-insight-graph", "figure"),
+app.clientside_callback(
+    """
+    function(data, viewType, template) {
+        if (!data) {
+            return window.dash_clientside.no_update;
+        }
+        var column = viewType === 'per_capita' ? 'Per10K' : 'Count';
+        var yTitle = data.y_titles[column];
+        
+        var traces = [];
+        var byType = {};
+        data.EngineerType.forEach(function(engineerType, i) {
+            var trace = byType[engineerType];
+            if (!trace) {
+                trace = {
+                    type: 'bar',
+                    name: engineerType,
+                    hovertemplate: 'Engineer Type=' + engineerType + '<br>Province/Territory=%{x}<br>' + yTitle + '=%{y}<extra></extra>',
+                    x: [],
+                    y: []
+                };
+                byType[engineerType] = trace;
+                traces.push(trace);
+            }
+            trace.x.push(data.Province[i]);
+            trace.y.push(data[column][i]);
+        });
+        
+        var layout = Object.assign({}, data.layout, {template: template});
+        layout.yaxis = Object.assign({}, layout.yaxis, {title: {text: yTitle}});
+        return {data: traces, layout: layout};
+    }
+    """,
+    Output("engineering-manpower-graph", "figure"),
     [
-        Input("occupation-category-dropdown", "value"),
-        Input("analysis-type-radio", "value")
-    ]
+        Input("engineering-manpower-data", "data"),
+        Input("engineering-view-radio", "value")
+    ],
+    State("figure-template", "data")
 )
-def update_custom_insight_graph(category, analysis_type):
-    category_filters = {
-        "business": ["business", "finance", "administration"],
-        "science": ["natural", "applied sciences", "engineering"],
-        "health": ["health", "nurse", "medical"],
-        "education": ["education", "law", "social"],
-        "art": ["art", "culture", "recreation"]
-    }
-    
-    filtered_df = df[
-        df['Occupation'].str.contains('|'.join(category_filters[category]), case=False, na=False)
-    ]
-    
+
+@cached_figure
+def build_custom_insight_figure(dataset, category, analysis_type):
     if analysis_type == "hierarchy":
-        filtered_df = filtered_df.copy()
-        filtered_df['Level'] = filtered_df['Occupation'].apply(lambda x: (len(x) - len(x.lstrip(' ')))) // 2
-        
-        level_data = filtered_df.groupby('Level').agg({
-            'Men': 'sum',
-            'Women': 'sum'
-        }).reset_index()
-        
-        level_data['Total'] = level_data['Men'] + level_data['Women']
-        level_data['Men_Pct'] = (level_data['Men'] / level_data['Total']) * 100
-        level_data['Women_Pct'] = (level_data['Women'] / level_data['Total']) * 100
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=level_data['Level'], y=level_data['Men_Pct'], name='Men', marker_color='blue'))
-        fig.add_trace(go.Bar(x=level_data['Level'], y=level_data['Women_Pct'], name='Women', marker_color='red'))
-        fig.add_shape(type="line", x0=-0.5, y0=50, x1=level_data['Level'].max()+0.5, y1=50, line=dict(color="green", width=2, dash="dash"))
+        rollup = dataset['hierarchy_rollup'][category]
+        levels = rollup['levels']
+        metrics.lap('frame')
+        
+        fig = go.Figure(layout=go.Layout(template=BAR_TEMPLATE))
+        fig.add_trace(go.Bar(x=levels, y=rollup['men_pct'], customdata=rollup['men'], name='Men', marker_color='blue',
+                             hovertemplate='Level %{x}<br>Men: %{y:.1f}% (%{customdata:,})<extra></extra>'))
+        fig.add_trace(go.Bar(x=levels, y=rollup['women_pct'], customdata=rollup['women'], name='Women', marker_color='red',
+                             hovertemplate='Level %{x}<br>Women: %{y:.1f}% (%{customdata:,})<extra></extra>'))
+        fig.add_shape(type="line", x0=(levels.min() if len(levels) else 1)-0.5, y0=50, x1=(levels.max() if len(levels) else 1)+0.5, y1=50, line=dict(color="green", width=2, dash="dash"))
         fig.update_layout(
             title=f'Gender Distribution by Hierarchy Level ({category.title()})',
-            xaxis_title='Hierarchy Level',
+            xaxis_title='Hierarchy Level (NOC code digits)',
+            xaxis_dtick=1,
             yaxis_title='Percentage (%)',
             barmode='group',
             height=600
         )
         
     else:
-        filtered_df = filtered_df.copy()
-        filtered_df['GPI'] = filtered_df.apply(lambda row: row['Women'] / row['Men'] if row['Men'] > 0 else float('inf'), axis=1)
-        sorted_df = filtered_df.sort_values('GPI')
-        
-        n_items = min(10, len(sorted_df) // 2)
-        bottom_n = sorted_df.head(n_items)
-        top_n = sorted_df.tail(n_items)
-        combined_df = pd.concat([bottom_n, top_n])
-        
-        fig = px.bar(
-            combined_df,
-            y='Occupation',
-            x='GPI',
-            orientation='h',
-            title=f'Gender Parity Index ({category.title()})',
-            labels={'Occupation': 'Occupation', 'GPI': 'Gender Parity Index (Women/Men)'},
-            color='GPI',
-            color_continuous_scale=['blue', 'white', 'red'],
-            range_color=[0, 2]
+        df = dataset['df']
+        rows = get_category_rows(dataset, OCCUPATION_CATEGORIES[category])
+        metrics.lap('filter')
+        
+        gpi = get_ratio_metric(df, rows, 'women_to_men')
+        
+        n_items = min(10, np.count_nonzero(~np.isnan(gpi)) // 2)
+        selected = np.concatenate([select_bottom_k(gpi, n_items), select_top_k(gpi, n_items)[::-1]])
+        combined_names = get_occupation_names(df, rows[selected])
+        combined_gpi = gpi[selected]
+        metrics.lap('frame')
+        
+        fig = go.Figure(
+            data=[go.Bar(
+                y=combined_names,
+                x=combined_gpi,
+                orientation='h',
+                marker=dict(
+                    color=combined_gpi,
+                    colorscale=[[0, 'blue'], [0.5, 'white'], [1, 'red']],
+                    cmin=0,
+                    cmax=2,
+                    colorbar=dict(title=dict(text='Gender Parity Index (Women/Men)'))
+                ),
+                hovertemplate='Occupation=%{y}<br>Gender Parity Index (Women/Men)=%{x}<extra></extra>'
+            )],
+            layout=go.Layout(
+                template=BAR_TEMPLATE,
+                title=f'Gender Parity Index ({category.title()})',
+                xaxis_title='Gender Parity Index (Women/Men)',
+                yaxis_title='Occupation',
+                height=800
+            )
         )
         
-        fig.add_shape(type="line", x0=1, y0=-0.5, x1=1, y1=len(combined_df)-0.5, line=dict(color="green", width=2, dash="dash"))
-        fig.update_layout(height=800)
+        fig.add_shape(type="line", x0=1, y0=-0.5, x1=1, y1=len(selected)-0.5, line=dict(color="green", width=2, dash="dash"))
     
     return fig
 
+@app.callback(
+    Output("custom-insight-graph", "figure"),
+    [
+        Input("occupation-category-dropdown", "value"),
+        Input("analysis-type-radio", "value")
+    ]
+)
+@timed_callback
+def update_custom_insight_graph(category, analysis_type):
+    figure = build_custom_insight_figure(category, analysis_type)
+    if is_triggered_by("occupation-category-dropdown"):
+        return patch_figure_data(figure, ['title', 'shapes'])
+    return figure
+
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000)
+    if '--build-snapshot' in sys.argv:
+        print(build_snapshot(DATA_PATH, registry.chunksize))
+    else:
+        app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,263 @@
+#Replays /_dash-update-component requests against gunicorn and reports throughput and latency.
+#
+#   python benchmarks/load_replay.py --configs sync:1,sync:4,gthread:2x4 --concurrency 1,8,32 --output load.json
+#   CALLBACK_RECORD_PATH=bodies.jsonl python app.py   (click around, then)
+#   python benchmarks/load_replay.py --bodies bodies.jsonl
+#
+#Every worker configuration gets a fresh gunicorn on a free local port, so runs are
+#independent and nothing leaves the machine. Request bodies are either synthesized
+#for the four graphs or replayed from a file recorded with CALLBACK_RECORD_PATH.
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPDATE_PATH = '/_dash-update-component'
+
+def callback_body(output, inputs, changed):
+    output_id, output_property = output.split('.')
+    return {
+        'output': output,
+        'outputs': {'id': output_id, 'property': output_property},
+        'inputs': [{'id': component_id, 'property': 'value', 'value': value} for component_id, value in inputs],
+        'changedPropIds': [f'{changed}.value'],
+        'state': []
+    }
+
+def get_json(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request('GET', path)
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+def synthesize_bodies(port, seed):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.request('GET', '/api/occupations?level=1&format=jsonl')
+    top_level = [json.loads(line)['Occupation'] for line in conn.getresponse().read().decode().splitlines()]
+    conn.close()
+    occupations = list(top_level)
+    for query in ['engineer', 'nurse', 'manager', 'teacher', 'technician']:
+        occupations.extend(get_json(port, f'/api/occupations/search?q={urllib.parse.quote(query)}&limit=20')['results'])
+
+    bodies = []
+    for service_type in ['all', 'police', 'fire', 'nurse']:
+        bodies.append(callback_body('essential-services-data.data', [('service-type-dropdown', service_type)], 'service-type-dropdown'))
+
+    noc_selections = [top_level[:3], top_level] + [rng.sample(occupations, rng.randint(1, 6)) for _ in range(12)]
+    for selected_nocs, chart_type in itertools.product(noc_selections, ['stack', 'group', 'ratio']):
+        for changed in ['noc-dropdown', 'chart-type-radio']:
+            bodies.append(callback_body(
+                'gender-employment-graph.figure',
+                [('noc-dropdown', selected_nocs), ('chart-type-radio', chart_type)],
+                changed
+            ))
+
+    engineering_types = ['computer', 'mechanical', 'electrical']
+    for size in range(len(engineering_types) + 1):
+        for selected_types in itertools.combinations(engineering_types, size):
+            bodies.append(callback_body('engineering-manpower-data.data', [('engineering-checklist', list(selected_types))], 'engineering-checklist'))
+
+    for category, analysis_type in itertools.product(['business', 'science', 'health', 'education', 'art'], ['hierarchy', 'parity']):
+        for changed in ['occupation-category-dropdown', 'analysis-type-radio']:
+            bodies.append(callback_body(
+                'custom-insight-graph.figure',
+                [('occupation-category-dropdown', category), ('analysis-type-radio', analysis_type)],
+                changed
+            ))
+
+    by_graph = {}
+    for body in bodies:
+        by_graph.setdefault(body['output'], []).append(body)
+    return by_graph
+
+def load_bodies(path):
+    by_graph = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                body = json.loads(line)
+                by_graph.setdefault(body['output'], []).append(body)
+    return by_graph
+
+def parse_config(config):
+    worker_class, _, size = config.partition(':')
+    workers, _, threads = (size or '1').partition('x')
+    return worker_class, int(workers), int(threads or 1)
+
+def find_free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(config, port, cold):
+    worker_class, workers, threads = parse_config(config)
+    env = dict(os.environ, DATASET_POLL_INTERVAL='0')
+    env.pop('CALLBACK_RECORD_PATH', None)
+    if cold:
+        env.update(FIGURE_CACHE_MAX_ENTRIES='0', FIGURE_WARMUP_PROCESSES='0')
+        env.pop('FIGURE_CACHE_DIR', None)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--worker-class', worker_class,
+         '--workers', str(workers), '--threads', str(threads), '--log-level', 'warning', 'app:server'],
+        cwd=REPO_ROOT, env=env
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with {process.returncode} for {config}')
+        try:
+            get_json(port, '/cache-stats')
+            return process
+        except (OSError, ValueError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'gunicorn did not become ready for {config}')
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def run_load(port, by_graph, concurrency, duration, seed):
+    graphs = sorted(by_graph)
+    samples = []
+    lock = threading.Lock()
+    start = threading.Barrier(concurrency + 1)
+
+    def client(index):
+        rng = random.Random(seed * 1000 + index)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        results = []
+        start.wait()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            graph = rng.choice(graphs)
+            payload = json.dumps(rng.choice(by_graph[graph]))
+            started = time.perf_counter()
+            try:
+                conn.request('POST', UPDATE_PATH, body=payload, headers={'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                ok = response.status in (200, 204)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                ok = False
+            results.append((graph.split('.')[0], time.perf_counter() - started, ok))
+        conn.close()
+        with lock:
+            samples.extend(results)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+def summarize(samples, elapsed):
+    latencies = np.array([latency for _, latency, ok in samples if ok]) * 1000
+    errors = sum(1 for _, _, ok in samples if not ok)
+    if not len(latencies):
+        return {'requests': len(samples), 'errors': errors, 'throughput_rps': 0.0}
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'mean_ms': round(float(latencies.mean()), 3)
+    }
+
+def run_config(config, args, concurrency_levels):
+    port = find_free_port()
+    process = start_server(config, port, args.cold)
+    try:
+        by_graph = load_bodies(args.bodies) if args.bodies else synthesize_bodies(port, args.seed)
+        runs = []
+        for concurrency in concurrency_levels:
+            print(f'{config} concurrency={concurrency}...', file=sys.stderr)
+            if args.warmup:
+                run_load(port, by_graph, concurrency, args.warmup, args.seed + 1)
+            samples, elapsed = run_load(port, by_graph, concurrency, args.duration, args.seed)
+            callbacks = {}
+            for name, latency, ok in samples:
+                callbacks.setdefault(name, []).append((name, latency, ok))
+            runs.append(dict(
+                summarize(samples, elapsed),
+                config=config,
+                concurrency=concurrency,
+                callbacks={name: summarize(values, elapsed) for name, values in sorted(callbacks.items())}
+            ))
+        return runs
+    finally:
+        stop_server(process)
+
+def format_table(runs):
+    lines = [f"{'config':<14}{'conc':>6}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}"]
+    for run in runs:
+        lines.append(
+            f"{run['config']:<14}{run['concurrency']:>6}{run['throughput_rps']:>10}"
+            f"{run.get('p50_ms', '-'):>10}{run.get('p99_ms', '-'):>10}{run['errors']:>8}"
+        )
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay Dash callback requests against gunicorn worker configurations.')
+    parser.add_argument('--configs', default='sync:2,gthread:2x4', help='comma-separated worker_class:workers[xthreads]')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated numbers of concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds per concurrency level')
+    parser.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds of load before each measurement')
+    parser.add_argument('--bodies', help='JSON lines of recorded request bodies (CALLBACK_RECORD_PATH) to replay')
+    parser.add_argument('--cold', action='store_true', help='disable the figure cache and warm-up so every request renders')
+    parser.add_argument('--seed', type=int, default=0, help='seed for synthesized bodies and request order')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    concurrency_levels = [int(value) for value in args.concurrency.split(',')]
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'duration_s': args.duration,
+            'bodies': args.bodies or 'synthesized',
+            'cold': args.cold,
+            'seed': args.seed
+        },
+        'runs': []
+    }
+    for config in args.configs.split(','):
+        results['runs'].extend(run_config(config, args, concurrency_levels))
+
+    print(format_table(results['runs']), file=sys.stderr)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
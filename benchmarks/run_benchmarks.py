@@ -0,0 +1,181 @@
+#Benchmarks app.py startup, callback latency, payload size and peak RSS.
+#
+#   python benchmarks/run_benchmarks.py --scales 1,10,100,1000 --output bench.json
+#   python benchmarks/run_benchmarks.py --baseline bench.json --threshold 0.2
+#
+#Every scale runs in a fresh interpreter so startup time and peak RSS are
+#measured per dataset size, the way a gunicorn worker would see them.
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_CSV = os.path.join(REPO_ROOT, 'data.csv')
+
+def write_scaled_csv(scale, directory):
+    path = os.path.join(directory, f'data_x{scale}.csv')
+    with open(SOURCE_CSV, newline='', encoding='utf-8') as src, open(path, 'w', newline='', encoding='utf-8') as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader)
+        rows = list(reader)
+        writer.writerow(header)
+        for copy in range(scale):
+            for row in rows:
+                if copy:
+                    row = [f'{row[0]} (copy {copy})'] + row[1:]
+                writer.writerow(row)
+    return path
+
+def iter_callback_inputs(app):
+    dataset = app.registry.current
+    top_level = list(dict.fromkeys(app.get_occupation_names(dataset['df'], dataset['noc_top_level_rows'])))
+
+    for service_type in ['all', 'police', 'fire', 'nurse']:
+        yield app.update_essential_services_graph, (service_type,)
+
+    noc_selections = [None, top_level[:3], top_level] + [[occupation] for occupation in top_level[:10]]
+    for selected_nocs, chart_type in itertools.product(noc_selections, ['stack', 'group', 'ratio']):
+        yield app.update_gender_employment_graph, (selected_nocs, chart_type)
+
+    engineering_types = ['computer', 'mechanical', 'electrical']
+    for size in range(1, len(engineering_types) + 1):
+        for selected_types in itertools.combinations(engineering_types, size):
+            yield app.update_engineering_manpower_graph, (list(selected_types),)
+
+    for category, analysis_type in itertools.product(['business', 'science', 'health', 'education', 'art'], ['hierarchy', 'parity']):
+        yield app.update_custom_insight_graph, (category, analysis_type)
+
+def summarize(latencies, payload_sizes):
+    latencies = np.array(latencies) * 1000
+    return {
+        'calls': len(latencies),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+        'max_ms': round(float(latencies.max()), 3),
+        'mean_payload_bytes': int(np.mean(payload_sizes)),
+        'max_payload_bytes': int(np.max(payload_sizes))
+    }
+
+def run_child(data_path, repeat):
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, REPO_ROOT)
+
+    started = time.perf_counter()
+    import app
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    load_times = []
+    build_times = []
+    for _ in range(3):
+        started = time.perf_counter()
+        df, version = app.load_dataset(data_path, app.registry.chunksize)
+        load_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        app.build_dataset(df, version, app.registry.province_path)
+        build_times.append(time.perf_counter() - started)
+
+    app.figure_cache = app.FigureCache(max_entries=0)
+
+    latencies = {}
+    payload_sizes = {}
+    for callback, args in iter_callback_inputs(app):
+        name = callback.__name__
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = callback(*args)
+            latencies.setdefault(name, []).append(time.perf_counter() - started)
+        payload_sizes.setdefault(name, []).append(len(json.dumps(result)))
+
+    return {
+        'rows': len(df),
+        'startup_ms': round(startup_ms, 3),
+        'load_dataset_ms': round(min(load_times) * 1000, 3),
+        'build_dataset_ms': round(min(build_times) * 1000, 3),
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'callbacks': {name: summarize(latencies[name], payload_sizes[name]) for name in latencies}
+    }
+
+def run_scale(scale, directory, repeat):
+    data_path = SOURCE_CSV if scale == 1 else write_scaled_csv(scale, directory)
+    env = dict(os.environ, DATA_PATH=data_path, DATASET_POLL_INTERVAL='0')
+    env.pop('FIGURE_CACHE_DIR', None)
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', data_path, '--repeat', str(repeat)],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def compare(results, baseline, threshold, min_delta_ms):
+    regressions = []
+    for scale, current in results['scales'].items():
+        previous = baseline['scales'].get(scale)
+        if previous is None:
+            continue
+        for name, stats in current['callbacks'].items():
+            before = previous['callbacks'].get(name)
+            if before is None:
+                continue
+            delta = stats['p95_ms'] - before['p95_ms']
+            if delta > min_delta_ms and delta > before['p95_ms'] * threshold:
+                regressions.append(f"x{scale} {name}: p95 {before['p95_ms']}ms -> {stats['p95_ms']}ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark app.py callbacks across dataset sizes.')
+    parser.add_argument('--scales', default='1,10,100,1000', help='comma-separated row multipliers of data.csv')
+    parser.add_argument('--repeat', type=int, default=5, help='calls per input combination')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--baseline', help='previous JSON report to compare p95 latency against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative p95 regression')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore regressions smaller than this')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.repeat)))
+        return 0
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'repeat': args.repeat
+        },
+        'scales': {}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in [int(value) for value in args.scales.split(',')]:
+            print(f'running x{scale}...', file=sys.stderr)
+            results['scales'][str(scale)] = run_scale(scale, directory, args.repeat)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
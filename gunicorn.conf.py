@@ -0,0 +1,19 @@
+import gc
+
+#Load app.py (and the dataset) once in the master so forked workers share its pages.
+preload_app = True
+
+#Callbacks only read the shared dataset, so threads in one worker can serve concurrent users.
+worker_class = 'gthread'
+threads = 4
+
+def when_ready(server):
+    #Fill the figure cache once in the master, so every worker forks with it instead of
+    #rendering the same figures itself.
+    import app
+    app.figure_warmup.run(app.registry.current)
+    
+    #Move everything allocated so far out of the collector's reach, so gc passes in a
+    #worker don't touch object headers and un-share the pages copy-on-write.
+    gc.collect()
+    gc.freeze()